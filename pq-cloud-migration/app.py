@@ -1,12 +1,19 @@
-from flask import Flask, request, jsonify
+from quart import Quart, request, jsonify, send_from_directory
+import asyncio
 import time
 import os
+import tempfile
 from crypto.compression import Compressor
-from crypto.hybrid import HybridEncryptor
+from crypto.hybrid import HybridEncryptor, wire_metadata
 from crypto.zkp import BatchZKP
 from cloud.uploader import CloudUploader
 
-app = Flask(__name__)
+app = Quart(__name__)
+# Quart caps request bodies at 16 MiB and 60 s by default. Lift the size cap
+# (Flask's default) so large uploads reach the pipeline, and give slow
+# clients up to 10 minutes to send the body.
+app.config["MAX_CONTENT_LENGTH"] = None
+app.config["BODY_TIMEOUT"] = 600
 compressor = Compressor()
 zkp = BatchZKP()
 uploader = CloudUploader()  # or CloudUploader(bucket_name="my-bucket")
@@ -16,36 +23,107 @@ try:
 except Exception:
     he = None
 
+def pipeline(reader, co, commits, sealer, stats: dict):
+    """
+    Single pass over an upload: read 64 KiB -> compress -> commit -> encrypt.
+    
+    Yields encrypted pieces as they are produced (compressed pieces if
+    sealer is None). Chunk commitments accumulate on commits; per-stage
+    nanoseconds and the compressed size accumulate in stats.
+    """
+    while True:
+        data = reader.read(Compressor.STREAM_CHUNK_SIZE)
+        t0 = time.perf_counter_ns()
+        piece = co.compress(data) if data else co.flush()
+        t1 = time.perf_counter_ns()
+        commits.update(piece)
+        t2 = time.perf_counter_ns()
+        out = sealer.update(piece) if sealer else piece
+        if sealer and not data:
+            out += sealer.finalize()
+        t3 = time.perf_counter_ns()
+        stats["compress"] += t1 - t0
+        stats["proof"] += t2 - t1
+        stats["encrypt"] += t3 - t2
+        stats["compressed"] += len(piece)
+        if out:
+            yield out
+        if not data:
+            return
+
 @app.route('/upload', methods=['POST'])
-def upload():
-    f = request.files.get('file')
-    sensitivity = request.form.get('sensitivity', 'medium')
+async def upload():
+    files = await request.files
+    form = await request.form
+    f = files.get('file')
+    sensitivity = form.get('sensitivity', 'medium')
     if not f:
         return jsonify({"error": "no file"}), 400
-    data = f.read()
-    t0 = time.time()
-    compressed = compressor.compress(data, sensitivity)
-    t1 = time.time()
-    chunks = [compressed[i:i+1024] for i in range(0, len(compressed), 1024)]
-    proof = zkp.make_proof(zkp.commitments(chunks))
-    t2 = time.time()
+    try:
+        co = compressor.compressobj(sensitivity)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    commits = zkp.commitment_stream()
     if he:
         pub, priv = he.generate_kem_keypair()
-        enc_blob, metadata = he.encrypt(compressed, pub)
+        sealer = he.encrypt_stream(pub)
+        metadata = sealer.metadata
     else:
-        enc_blob, metadata = compressed, {}
-    t3 = time.time()
+        sealer, metadata = None, {}
+    stats = {"compress": 0, "proof": 0, "encrypt": 0, "compressed": 0}
     os.makedirs('cloud', exist_ok=True)
-    enc_path = uploader.upload_local(os.path.join('cloud', f.filename + '.enc'), enc_blob)
-    proof_path = uploader.upload_local(os.path.join('cloud', f.filename + '.proof'), proof)
+    enc_path = os.path.join('cloud', f.filename + '.enc')
+    
+    def encrypt_and_prove():
+        # Stream into a temp name so a failed upload never truncates an
+        # earlier good .enc; it only replaces enc_path once complete
+        fd, part_path = tempfile.mkstemp(dir='cloud', suffix='.enc.part')
+        written = 0
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for part in pipeline(f.stream, co, commits, sealer, stats):
+                    written += out.write(part)
+            os.replace(part_path, enc_path)
+        except BaseException:
+            os.remove(part_path)
+            raise
+        t0 = time.perf_counter_ns()
+        proof = zkp.make_proof(commits.finalize())
+        stats["proof"] += time.perf_counter_ns() - t0
+        
+        # In bucket mode the finished blob goes through the uploader like the proof
+        enc_ref = enc_path
+        if getattr(uploader, "bucket_name", None):
+            with open(enc_path, 'rb') as blob:
+                enc_ref = uploader.upload_local(enc_path, blob.read())
+        return written, enc_ref, proof
+    
+    # The fused pipeline and Merkle folding run in a worker thread so the
+    # event loop keeps serving requests
+    enc_size, enc_ref, proof = await asyncio.to_thread(encrypt_and_prove)
+    input_size = f.stream.tell()
+    proof_path = await asyncio.to_thread(uploader.upload_local, os.path.join('cloud', f.filename + '.proof'), proof)
     return jsonify({
-        "timings": {"compress": t1-t0, "proof": t2-t1, "encrypt": t3-t2},
-        "sizes": {"input": len(data), "compressed": len(compressed), "enc": len(enc_blob), "proof": len(proof)},
-        "paths": {"enc": enc_path, "proof": proof_path},
-        "metadata": metadata
+        "timings": {k: stats[k] / 1e9 for k in ("compress", "proof", "encrypt")},
+        "sizes": {"input": input_size, "compressed": stats["compressed"], "enc": enc_size, "proof": len(proof)},
+        "paths": {"enc": enc_ref, "proof": proof_path},
+        "metadata": wire_metadata(metadata)
     })
 
+@app.route('/download/<path:file_name>', methods=['GET'])
+async def download(file_name):
+    # Streams the stored .enc/.proof artifact from disk in chunks instead of
+    # reading it into memory; send_from_directory rejects paths outside cloud/
+    return await send_from_directory('cloud', file_name, as_attachment=True)
+
 if __name__ == '__main__':
+    # Development server. For production run under hypercorn, e.g.
+    #   hypercorn app:app --worker-class uvloop --workers $(nproc)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     os.makedirs('cloud', exist_ok=True)
     app.run(debug=True, port=5000)
 
@@ -1,7 +1,7 @@
 import os
 import csv
 import time
-import base64
+import atexit
 from pathlib import Path
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes
@@ -15,17 +15,30 @@ class PerformanceEvaluator:
     Run experiments for PQ KEM (Kyber) vs RSA+AES (classical hybrid).
     Call run_single for test cases; results appended to CSV.
     """
+    FIELDNAMES = ["method", "sensitivity", "input_size", "compressed_size",
+                  "enc_blob_size", "proof_size", "enc_time", "dec_time"]
+
     def __init__(self, out_csv: str = "data/results.csv"):
         self.out_csv = out_csv
         os.makedirs(os.path.dirname(out_csv), exist_ok=True)
+        # Open the CSV once for the evaluator's lifetime instead of per row
+        write_header = not Path(out_csv).exists() or Path(out_csv).stat().st_size == 0
+        self._csv_fp = open(out_csv, "a", newline="")
+        self._writer = csv.DictWriter(self._csv_fp, fieldnames=self.FIELDNAMES)
+        if write_header:
+            self._writer.writeheader()
+        atexit.register(self._csv_fp.close)
         self.compressor = Compressor()
         self.zkp = BatchZKP()
+        # Keypairs are generated once so keygen doesn't dominate enc_time
+        self.he = HybridEncryptor()
+        self.kyber_pub, self.kyber_priv = self.he.generate_kem_keypair()
+        self.rsa_priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.rsa_pub = self.rsa_priv.public_key()
 
     def rsa_encrypt_aes(self, plaintext: bytes):
-        priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        pub = priv.public_key()
         sym = AESGCM.generate_key(bit_length=256)
-        enc_sym = pub.encrypt(
+        enc_sym = self.rsa_pub.encrypt(
             sym,
             padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
                          algorithm=hashes.SHA256(),
@@ -34,30 +47,27 @@ class PerformanceEvaluator:
         aesgcm = AESGCM(sym)
         nonce = os.urandom(12)
         ct = aesgcm.encrypt(nonce, plaintext, None)
-        metadata = {"rsa_enc_sym": base64.b64encode(enc_sym).decode(), "nonce": base64.b64encode(nonce).decode()}
-        return nonce + ct, metadata, priv
+        metadata = {"rsa_enc_sym": enc_sym, "nonce": nonce}
+        return nonce + ct, metadata, self.rsa_priv
 
     def run_single(self, data: bytes, sensitivity: str, use_pq: bool = True):
         compressed = self.compressor.compress(data, sensitivity)
-        chunks = [compressed[i:i+1024] for i in range(0, len(compressed), 1024)]
-        commitments = self.zkp.commitments(chunks)
+        commitments = self.zkp.commitments_from_buffer(compressed)
         proof = self.zkp.make_proof(commitments)
 
         if use_pq:
-            he = HybridEncryptor()
-            pub, priv = he.generate_kem_keypair()
-            t0 = time.time()
-            blob, metadata = he.encrypt(compressed, pub)
-            enc_time = time.time() - t0
-            t1 = time.time()
-            _ = he.decrypt(blob, metadata, priv)
-            dec_time = time.time() - t1
+            t0 = time.perf_counter_ns()
+            blob, metadata = self.he.encrypt(compressed, self.kyber_pub)
+            enc_ns = time.perf_counter_ns() - t0
+            t1 = time.perf_counter_ns()
+            _ = self.he.decrypt(blob, metadata, self.kyber_priv)
+            dec_ns = time.perf_counter_ns() - t1
             method = "Kyber"
         else:
-            t0 = time.time()
+            t0 = time.perf_counter_ns()
             blob, metadata, priv = self.rsa_encrypt_aes(compressed)
-            enc_time = time.time() - t0
-            dec_time = 0.0
+            enc_ns = time.perf_counter_ns() - t0
+            dec_ns = 0
             method = "RSA"
 
         row = {
@@ -67,15 +77,11 @@ class PerformanceEvaluator:
             "compressed_size": len(compressed),
             "enc_blob_size": len(blob),
             "proof_size": len(proof),
-            "enc_time": enc_time,
-            "dec_time": dec_time
+            "enc_time": enc_ns / 1e9,
+            "dec_time": dec_ns / 1e9
         }
-        write_header = not Path(self.out_csv).exists()
-        with open(self.out_csv, "a", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=list(row.keys()))
-            if write_header:
-                w.writeheader()
-            w.writerow(row)
+        self._writer.writerow(row)
+        self._csv_fp.flush()
         return row
 
 if __name__ == "__main__":
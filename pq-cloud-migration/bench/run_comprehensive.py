@@ -11,7 +11,8 @@ import os
 import csv
 import json
 import time
-import base64
+import itertools
+import numpy as np
 from pathlib import Path
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes
@@ -33,6 +34,9 @@ class ComprehensivePerformanceEvaluator:
     - Multiple sensitivity levels (low, medium, high)
     """
     
+    # Entropy profile of the generated payloads, recorded in the CSV
+    PAYLOAD_PROFILE = "50% random + 50% repeated"
+    
     def __init__(self, out_csv: str = "data/results.csv", out_summary: str = "data/summary.json"):
         self.out_csv = out_csv
         self.out_summary = out_summary
@@ -41,13 +45,36 @@ class ComprehensivePerformanceEvaluator:
         self.compressor = Compressor()
         self.zkp = BatchZKP()
         self.results = []
+        
+        self.test_sizes = {
+            "1KB": 1024,
+            "10KB": 10 * 1024,
+            "100KB": 100 * 1024,
+            "1MB": 1024 * 1024,
+        }
+        # Payloads are generated once and reused by every sensitivity/method run.
+        # Pure random data is incompressible, so half of each payload is a
+        # repeated byte to give the compression stage realistic work.
+        self.payloads = {
+            name: os.urandom(size // 2) + b"A" * (size - size // 2)
+            for name, size in self.test_sizes.items()
+        }
+        
+        # Generate keypairs once; keygen is reported separately, not per test
+        self.he = HybridEncryptor()
+        t0 = time.perf_counter_ns()
+        self.kyber_pub, self.kyber_priv = self.he.generate_kem_keypair()
+        self.kyber_keygen_ns = time.perf_counter_ns() - t0
+        
+        t0 = time.perf_counter_ns()
+        self.rsa_priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.rsa_pub = self.rsa_priv.public_key()
+        self.rsa_keygen_ns = time.perf_counter_ns() - t0
     
     def rsa_encrypt_aes(self, plaintext: bytes):
-        """RSA + AES-GCM encryption (classical hybrid)."""
-        priv = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        pub = priv.public_key()
+        """RSA + AES-GCM encryption (classical hybrid) with the cached RSA keypair."""
         sym = AESGCM.generate_key(bit_length=256)
-        enc_sym = pub.encrypt(
+        enc_sym = self.rsa_pub.encrypt(
             sym,
             padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()),
                          algorithm=hashes.SHA256(),
@@ -57,61 +84,64 @@ class ComprehensivePerformanceEvaluator:
         nonce = os.urandom(12)
         ct = aesgcm.encrypt(nonce, plaintext, None)
         metadata = {
-            "rsa_enc_sym": base64.b64encode(enc_sym).decode(),
-            "nonce": base64.b64encode(nonce).decode()
+            "rsa_enc_sym": enc_sym,
+            "nonce": nonce
         }
-        return nonce + ct, metadata, priv
+        return nonce + ct, metadata, self.rsa_priv
     
-    def run_single(self, data: bytes, sensitivity: str, use_pq: bool = True, test_id: str = ""):
+    def run_single(self, data: bytes, sensitivity: str, use_pq: bool = True, test_id: str = "",
+                   payload_profile: str = ""):
         """
         Run single test: compression + ZKP + encryption (Kyber or RSA).
+        Uses the keypairs generated in __init__; keygen_time_ms is the
+        one-off keygen cost and is not included in total_time_ms.
         
         Args:
             data: Raw data to process
             sensitivity: Sensitivity level (low/medium/high)
             use_pq: Use Kyber (True) or RSA (False)
             test_id: Optional test identifier for logging
+            payload_profile: Optional description of the input's entropy profile
             
         Returns:
             Dictionary with timing and size metrics
         """
         # Compress
-        t0 = time.time()
+        t0 = time.perf_counter_ns()
         compressed = self.compressor.compress(data, sensitivity)
-        comp_time = time.time() - t0
+        comp_ns = time.perf_counter_ns() - t0
         
         # ZKP
-        chunks = [compressed[i:i+1024] for i in range(0, len(compressed), 1024)]
-        t1 = time.time()
-        commitments = self.zkp.commitments(chunks)
+        t1 = time.perf_counter_ns()
+        commitments = self.zkp.commitments_from_buffer(compressed)
         proof = self.zkp.make_proof(commitments)
-        zkp_time = time.time() - t1
+        zkp_ns = time.perf_counter_ns() - t1
         
         # Encryption
         if use_pq:
-            he = HybridEncryptor()
-            pub, priv = he.generate_kem_keypair()
-            t2 = time.time()
-            blob, metadata = he.encrypt(compressed, pub)
-            enc_time = time.time() - t2
+            t2 = time.perf_counter_ns()
+            blob, metadata = self.he.encrypt(compressed, self.kyber_pub)
+            enc_ns = time.perf_counter_ns() - t2
             
-            t3 = time.time()
+            t3 = time.perf_counter_ns()
             try:
-                recovered = he.decrypt(blob, metadata, priv)
+                recovered = self.he.decrypt(blob, metadata, self.kyber_priv)
                 assert recovered == compressed
                 dec_ok = True
             except:
                 dec_ok = False
-            dec_time = time.time() - t3
+            dec_ns = time.perf_counter_ns() - t3
+            keygen_ns = self.kyber_keygen_ns
             method = "Kyber-512"
         else:
-            t2 = time.time()
+            t2 = time.perf_counter_ns()
             blob, metadata, priv = self.rsa_encrypt_aes(compressed)
-            enc_time = time.time() - t2
+            enc_ns = time.perf_counter_ns() - t2
             
             # RSA decryption not implemented for simplicity
-            dec_time = 0.0
+            dec_ns = 0
             dec_ok = False
+            keygen_ns = self.rsa_keygen_ns
             method = "RSA-2048+AES"
         
         # Calculate metrics
@@ -122,15 +152,17 @@ class ComprehensivePerformanceEvaluator:
             "method": method,
             "sensitivity": sensitivity,
             "input_size_bytes": len(data),
+            "payload_profile": payload_profile,
             "compressed_size_bytes": len(compressed),
             "encrypted_size_bytes": len(blob),
             "proof_size_bytes": len(proof),
             "compression_ratio_percent": round(comp_ratio, 2),
-            "compress_time_ms": round(comp_time * 1000, 4),
-            "zkp_time_ms": round(zkp_time * 1000, 4),
-            "encrypt_time_ms": round(enc_time * 1000, 4),
-            "decrypt_time_ms": round(dec_time * 1000, 4),
-            "total_time_ms": round((comp_time + zkp_time + enc_time + dec_time) * 1000, 4),
+            "keygen_time_ms": round(keygen_ns / 1e6, 4),
+            "compress_time_ms": round(comp_ns / 1e6, 4),
+            "zkp_time_ms": round(zkp_ns / 1e6, 4),
+            "encrypt_time_ms": round(enc_ns / 1e6, 4),
+            "decrypt_time_ms": round(dec_ns / 1e6, 4),
+            "total_time_ms": round((comp_ns + zkp_ns + enc_ns + dec_ns) / 1e6, 4),
             "decryption_ok": dec_ok
         }
         
@@ -144,17 +176,10 @@ class ComprehensivePerformanceEvaluator:
         - Sensitivities: low, medium, high
         - Methods: Kyber, RSA
         """
-        test_sizes = {
-            "1KB": 1024,
-            "10KB": 10 * 1024,
-            "100KB": 100 * 1024,
-            "1MB": 1024 * 1024,
-        }
-        
         sensitivities = ["low", "medium", "high"]
         methods = [True, False]  # True = Kyber, False = RSA
         
-        total_tests = len(test_sizes) * len(sensitivities) * len(methods)
+        total_tests = len(self.test_sizes) * len(sensitivities) * len(methods)
         test_num = 0
         
         print(f"\n{'='*80}")
@@ -163,22 +188,19 @@ class ComprehensivePerformanceEvaluator:
         print(f"Total tests: {total_tests}")
         print(f"{'='*80}\n")
         
-        for size_name, size_bytes in test_sizes.items():
-            data = os.urandom(size_bytes)  # Random data for realistic compression
+        for (size_name, data), sensitivity, use_pq in itertools.product(
+                self.payloads.items(), sensitivities, methods):
+            test_num += 1
+            method_name = "Kyber" if use_pq else "RSA"
+            test_id = f"{test_num}/{total_tests}"
             
-            for sensitivity in sensitivities:
-                for use_pq in methods:
-                    test_num += 1
-                    method_name = "Kyber" if use_pq else "RSA"
-                    test_id = f"{test_num}/{total_tests}"
-                    
-                    print(f"[{test_id}] {size_name} + {sensitivity:6s} + {method_name:6s} ...", end=" ", flush=True)
-                    
-                    try:
-                        result = self.run_single(data, sensitivity, use_pq, test_id)
-                        print(f"✓ {result['total_time_ms']}ms")
-                    except Exception as e:
-                        print(f"✗ Error: {e}")
+            print(f"[{test_id}] {size_name} + {sensitivity:6s} + {method_name:6s} ...", end=" ", flush=True)
+            
+            try:
+                result = self.run_single(data, sensitivity, use_pq, test_id, self.PAYLOAD_PROFILE)
+                print(f"✓ {result['total_time_ms']}ms")
+            except Exception as e:
+                print(f"✗ Error: {e}")
         
         print(f"\n{'='*80}")
         print(f"Completed {test_num} tests")
@@ -215,12 +237,12 @@ class ComprehensivePerformanceEvaluator:
         def stats(results, metric):
             if not results:
                 return {"min": 0, "max": 0, "avg": 0, "count": 0}
-            values = [r[metric] for r in results]
+            values = np.fromiter((r[metric] for r in results), dtype=np.float64, count=len(results))
             return {
-                "min": min(values),
-                "max": max(values),
-                "avg": round(sum(values) / len(values), 2),
-                "count": len(values)
+                "min": values.min().item(),
+                "max": values.max().item(),
+                "avg": round(values.mean().item(), 2),
+                "count": values.size
             }
         
         summary = {
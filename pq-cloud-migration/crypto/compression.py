@@ -1,12 +1,61 @@
 """
 Sensitivity-Adaptive Compression Module
-Implements zlib compression with sensitivity levels:
-- Low: maximum compression (aggressive, 9)
-- Medium: balanced compression (6)
-- High: minimal compression (minimal data loss, 1)
+Implements LZ4 frame compression with sensitivity levels:
+- Low: maximum compression (aggressive, LZ4-HC 6 / zlib 9)
+- Medium: balanced compression (LZ4-HC 3 / zlib 6)
+- High: minimal compression (minimal data loss, LZ4 fast 0 / zlib 1)
+
+If lz4 is not installed, falls back to zlib. Decompression sniffs the
+frame magic so blobs written by either backend still decode.
 """
+import functools
+import io
 import zlib
 
+try:
+    import lz4.frame
+    HAVE_LZ4 = True
+except ImportError:
+    HAVE_LZ4 = False
+
+LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+LZ4_BLOCK_SIZE = 64 * 1024  # lz4.frame default max block size
+
+
+class _LZ4FrameStream:
+    """
+    zlib.compressobj-style wrapper around LZ4FrameCompressor.
+    
+    Streams of up to one block give the same bytes as Compressor.compress():
+    lz4.frame.compress() flags a frame that fits in one block as
+    independent-block, which a stream cannot know up front, so input is
+    held until it exceeds one block and short streams are compressed in
+    one shot at flush(). Longer streams start the frame with the held
+    block; they decode to the same data, but match finding can differ
+    with how the input was split.
+    """
+    
+    def __init__(self, level: int):
+        self._level = level
+        self._co = None
+        self._pending = bytearray()
+    
+    def compress(self, data: bytes) -> bytes:
+        if self._co is not None:
+            return self._co.compress(data)
+        self._pending += data
+        if len(self._pending) <= LZ4_BLOCK_SIZE:
+            return b""
+        self._co = lz4.frame.LZ4FrameCompressor(compression_level=self._level)
+        out = self._co.begin() + self._co.compress(bytes(self._pending))
+        self._pending = None
+        return out
+    
+    def flush(self) -> bytes:
+        if self._co is None:
+            return lz4.frame.compress(bytes(self._pending), compression_level=self._level, store_size=False)
+        return self._co.flush()
+
 
 class Compressor:
     """
@@ -15,14 +64,29 @@ class Compressor:
     """
     
     SENSITIVITY_LEVELS = {
-        "low": 9,      # Maximum compression (for non-sensitive data)
-        "medium": 6,   # Balanced compression
-        "high": 1      # Minimal compression (for sensitive data)
+        "low": 6,      # Maximum compression (for non-sensitive data)
+        "medium": 3,   # Balanced compression
+        "high": 0      # Minimal compression (for sensitive data)
+    } if HAVE_LZ4 else {
+        "low": 9,
+        "medium": 6,
+        "high": 1
     }
     
+    # One-shot compressors pre-bound to each sensitivity's level. The LZ4
+    # frame omits the content size, which a stream cannot know up front, so
+    # short inputs compress to the same bytes through compressobj()
+    _DISPATCH = {
+        name: functools.partial(lz4.frame.compress, compression_level=level, store_size=False) if HAVE_LZ4
+        else functools.partial(zlib.compress, level=level)
+        for name, level in SENSITIVITY_LEVELS.items()
+    }
+    
+    STREAM_CHUNK_SIZE = 64 * 1024  # Read size for compress_stream
+    
     def compress(self, data: bytes, sensitivity: str = "medium") -> bytes:
         """
-        Compress data using zlib with sensitivity-based compression level.
+        Compress data using LZ4 (or zlib fallback) with sensitivity-based level.
         
         Args:
             data: Raw bytes to compress
@@ -31,16 +95,53 @@ class Compressor:
         Returns:
             Compressed bytes
         """
+        try:
+            compress = self._DISPATCH[sensitivity]
+        except KeyError:
+            raise ValueError(f"Invalid sensitivity: {sensitivity}. Must be low/medium/high") from None
+        return compress(data)
+    
+    def compressobj(self, sensitivity: str = "medium"):
+        """
+        Create an incremental compressor for one stream.
+        
+        Args:
+            sensitivity: "low", "medium", or "high"
+            
+        Returns:
+            Object with compress(chunk) -> bytes and flush() -> bytes; the
+            concatenated output has the same format as compress() (and the
+            same bytes for inputs of up to LZ4_BLOCK_SIZE)
+        """
         if sensitivity not in self.SENSITIVITY_LEVELS:
             raise ValueError(f"Invalid sensitivity: {sensitivity}. Must be low/medium/high")
         
         level = self.SENSITIVITY_LEVELS[sensitivity]
-        compressed = zlib.compress(data, level=level)
-        return compressed
+        if HAVE_LZ4:
+            return _LZ4FrameStream(level)
+        return zlib.compressobj(level)
+    
+    def compress_stream(self, reader, sensitivity: str = "medium") -> bytes:
+        """
+        Compress a file-like object without reading it fully into memory.
+        
+        Args:
+            reader: Object with a read(size) method (e.g. an upload stream)
+            sensitivity: "low", "medium", or "high"
+            
+        Returns:
+            Compressed bytes (same format as compress())
+        """
+        co = self.compressobj(sensitivity)
+        out = io.BytesIO()
+        while chunk := reader.read(self.STREAM_CHUNK_SIZE):
+            out.write(co.compress(chunk))
+        out.write(co.flush())
+        return out.getvalue()
     
     def decompress(self, compressed_data: bytes) -> bytes:
         """
-        Decompress zlib-compressed data.
+        Decompress LZ4- or zlib-compressed data.
         
         Args:
             compressed_data: Compressed bytes
@@ -48,6 +149,10 @@ class Compressor:
         Returns:
             Decompressed original data
         """
+        if compressed_data[:4] == LZ4_FRAME_MAGIC:
+            if not HAVE_LZ4:
+                raise RuntimeError("LZ4-compressed data requires the lz4 package")
+            return lz4.frame.decompress(compressed_data)
         return zlib.decompress(compressed_data)
     
     def get_compression_ratio(self, original_size: int, compressed_size: int) -> float:
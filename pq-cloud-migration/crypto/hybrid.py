@@ -6,10 +6,64 @@ If liboqs/pyoqs is installed: uses real Kyber
 If not available: uses simulated KEM (safe for demos/testing)
 """
 import os
-import hashlib
 import base64
+import hashlib
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+try:
+    import blake3
+    HAVE_BLAKE3 = True
+except ImportError:
+    HAVE_BLAKE3 = False
+
+AES_CHUNK_SIZE = 32 * 1024  # Plaintext slice size fed to the GCM encryptor
+
+
+def _derive_pub(priv: bytes) -> bytes:
+    """Simulated KEM public key for a private key."""
+    return hashlib.sha256(priv).digest()
+
+
+def _simulated_kem_kdf(public_key: bytes, seed: bytes, kdf: str) -> bytes:
+    """Derive the simulated KEM shared secret from public key + seed."""
+    if kdf == "blake3":
+        if not HAVE_BLAKE3:
+            raise ValueError("Metadata uses the blake3 KDF, which is not installed")
+        hasher = blake3.blake3(public_key)
+    else:
+        hasher = hashlib.sha256(public_key)
+    hasher.update(seed)
+    return hasher.digest()
+
+
+def _aes_gcm_seal(key: bytes, nonce: bytes, plaintext: bytes) -> bytes:
+    """
+    AES-GCM encrypt plaintext in AES_CHUNK_SIZE slices through one encryptor.
+    Inputs that fit in a single slice use the one-shot AESGCM API, which has
+    lower setup cost.
+    
+    Returns:
+        nonce + ciphertext + tag (same layout as nonce + AESGCM.encrypt())
+    """
+    if len(plaintext) <= AES_CHUNK_SIZE:
+        return nonce + AESGCM(key).encrypt(nonce, plaintext, None)
+    
+    encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+    mv = memoryview(plaintext)
+    parts = [nonce]
+    for i in range(0, len(mv), AES_CHUNK_SIZE):
+        parts.append(encryptor.update(mv[i:i + AES_CHUNK_SIZE]))
+    parts.append(encryptor.finalize())
+    parts.append(encryptor.tag)
+    return b"".join(parts)
+
+
+def wire_metadata(metadata: dict) -> dict:
+    """Base64-encode the raw bytes fields of encryption metadata for JSON."""
+    return {k: base64.b64encode(v).decode() if isinstance(v, bytes) else v
+            for k, v in metadata.items()}
+
 
 class HybridEncryptor:
     """
@@ -70,7 +124,7 @@ class HybridEncryptor:
         # Generate a 32-byte seed (simulates private key)
         priv_key = os.urandom(32)
         # Derive public key from private key using SHA-256
-        pub_key = hashlib.sha256(priv_key).digest()
+        pub_key = _derive_pub(priv_key)
         return pub_key, priv_key
     
     def encrypt(self, plaintext: bytes, public_key: bytes):
@@ -83,60 +137,93 @@ class HybridEncryptor:
             
         Returns:
             (ciphertext, metadata) tuple where metadata contains encapsulated key info
+            (kem_ciphertext and nonce as raw bytes; encode at the storage/wire boundary)
         """
         if self.kyber_available:
             return self._real_kyber_encrypt(plaintext, public_key)
         else:
             return self._simulated_kyber_encrypt(plaintext, public_key)
     
+    def encrypt_stream(self, public_key: bytes) -> "GCMEncryptStream":
+        """
+        Start an incremental Kyber KEM + AES-GCM encryption.
+        
+        Args:
+            public_key: Kyber public key
+            
+        Returns:
+            GCMEncryptStream; concatenating its update()/finalize() output
+            gives the same blob layout as encrypt(), and its metadata
+            attribute holds the encapsulated key info
+        """
+        if self.kyber_available:
+            try:
+                aes_key, metadata = self._real_kyber_encapsulate(public_key)
+            except Exception as e:
+                print(f"[WARNING] Real Kyber encryption failed: {e}. Falling back to simulated KEM.")
+                aes_key, metadata = self._simulated_kyber_encapsulate(public_key)
+        else:
+            aes_key, metadata = self._simulated_kyber_encapsulate(public_key)
+        return GCMEncryptStream(aes_key, metadata)
+    
+    def _real_kyber_encapsulate(self, public_key: bytes):
+        """Encapsulate a fresh AES key with real Kyber (requires liboqs)."""
+        kem = self.liboqs.KeyEncapsulation("Kyber512", public_key)
+        kem_ciphertext, shared_secret = kem.encap_secret()
+        
+        # Use shared secret to derive AES key
+        aes_key = shared_secret[:32]  # Take first 32 bytes for AES-256
+        metadata = {
+            "kem_ciphertext": kem_ciphertext,
+            "nonce": os.urandom(12),
+            "method": "Kyber512+AES256GCM"
+        }
+        return aes_key, metadata
+    
+    def _simulated_kyber_encapsulate(self, public_key: bytes):
+        """
+        Simulated Kyber encapsulation using a BLAKE3 (or SHA-256) based KEM.
+        For demo/testing purposes only.
+        """
+        # Simulate KEM encapsulation: derive shared secret from public key + random seed.
+        # Seed and nonce come from one urandom call (one getrandom syscall).
+        entropy = os.urandom(32 + 12)
+        random_seed, nonce = entropy[:32], entropy[32:]
+        kdf = "blake3" if HAVE_BLAKE3 else "sha256"
+        shared_secret = _simulated_kem_kdf(public_key, random_seed, kdf)
+        
+        # Use shared secret as AES key (a full-length slice returns the same object, no copy)
+        aes_key = shared_secret[:32]
+        metadata = {
+            "kem_ciphertext": random_seed,
+            "nonce": nonce,
+            "kdf": kdf,
+            "method": "Simulated-Kyber512+AES256GCM"
+        }
+        return aes_key, metadata
+    
     def _real_kyber_encrypt(self, plaintext: bytes, public_key: bytes):
         """Encrypt using real Kyber (requires liboqs)."""
         try:
-            kem = self.liboqs.KeyEncapsulation("Kyber512", public_key)
-            kem_ciphertext, shared_secret = kem.encap_secret()
-            
-            # Use shared secret to derive AES key
-            aes_key = shared_secret[:32]  # Take first 32 bytes for AES-256
-            nonce = os.urandom(12)
+            aes_key, metadata = self._real_kyber_encapsulate(public_key)
             
             # AES-GCM encryption
-            cipher = AESGCM(aes_key)
-            ciphertext = cipher.encrypt(nonce, plaintext, None)
-            
-            metadata = {
-                "kem_ciphertext": base64.b64encode(kem_ciphertext).decode(),
-                "nonce": base64.b64encode(nonce).decode(),
-                "method": "Kyber512+AES256GCM"
-            }
-            return nonce + ciphertext, metadata
+            blob = _aes_gcm_seal(aes_key, metadata["nonce"], plaintext)
+            return blob, metadata
         except Exception as e:
             print(f"[WARNING] Real Kyber encryption failed: {e}. Falling back to simulated KEM.")
             return self._simulated_kyber_encrypt(plaintext, public_key)
     
     def _simulated_kyber_encrypt(self, plaintext: bytes, public_key: bytes):
         """
-        Simulated Kyber encryption using SHA-256 based KEM.
+        Simulated Kyber encryption using a BLAKE3 (or SHA-256) based KEM.
         For demo/testing purposes only.
         """
-        # Simulate KEM encapsulation: derive shared secret from public key + random seed
-        random_seed = os.urandom(32)
-        combined = public_key + random_seed
-        shared_secret = hashlib.sha256(combined).digest()
-        
-        # Use shared secret as AES key
-        aes_key = shared_secret[:32]
-        nonce = os.urandom(12)
+        aes_key, metadata = self._simulated_kyber_encapsulate(public_key)
         
         # AES-GCM encryption
-        cipher = AESGCM(aes_key)
-        ciphertext = cipher.encrypt(nonce, plaintext, None)
-        
-        metadata = {
-            "kem_ciphertext": base64.b64encode(random_seed).decode(),
-            "nonce": base64.b64encode(nonce).decode(),
-            "method": "Simulated-Kyber512+AES256GCM"
-        }
-        return nonce + ciphertext, metadata
+        blob = _aes_gcm_seal(aes_key, metadata["nonce"], plaintext)
+        return blob, metadata
     
     def decrypt(self, ciphertext: bytes, metadata: dict, private_key: bytes):
         """
@@ -144,7 +231,7 @@ class HybridEncryptor:
         
         Args:
             ciphertext: Encrypted data (nonce + encrypted blob)
-            metadata: Metadata from encryption (contains kem_ciphertext, nonce)
+            metadata: Metadata from encryption (contains raw kem_ciphertext, nonce bytes)
             private_key: Kyber private key
             
         Returns:
@@ -158,8 +245,8 @@ class HybridEncryptor:
     def _real_kyber_decrypt(self, ciphertext: bytes, metadata: dict, private_key: bytes):
         """Decrypt using real Kyber (requires liboqs)."""
         try:
-            kem_ciphertext = base64.b64decode(metadata["kem_ciphertext"])
-            nonce = base64.b64decode(metadata["nonce"])
+            kem_ciphertext = metadata["kem_ciphertext"]
+            nonce = metadata["nonce"]
             
             kem = self.liboqs.KeyEncapsulation("Kyber512")
             kem.import_secret_key(private_key)
@@ -178,17 +265,17 @@ class HybridEncryptor:
     
     def _simulated_kyber_decrypt(self, ciphertext: bytes, metadata: dict, private_key: bytes):
         """
-        Simulated Kyber decryption using SHA-256 based KEM.
+        Simulated Kyber decryption using a BLAKE3 (or SHA-256) based KEM.
         For demo/testing purposes only.
         """
-        kem_ciphertext = base64.b64decode(metadata["kem_ciphertext"])  # This is random_seed
-        nonce = base64.b64decode(metadata["nonce"])
+        kem_ciphertext = metadata["kem_ciphertext"]  # This is random_seed
+        nonce = metadata["nonce"]
         
         # Simulate KEM decapsulation: derive shared secret from private key + random seed
         # We use private key's hash to simulate recovery
-        public_key_recovered = hashlib.sha256(private_key).digest()
-        combined = public_key_recovered + kem_ciphertext
-        shared_secret = hashlib.sha256(combined).digest()
+        public_key_recovered = _derive_pub(private_key)
+        shared_secret = _simulated_kem_kdf(public_key_recovered, kem_ciphertext,
+                                           metadata.get("kdf", "sha256"))
         
         # Use shared secret as AES key
         aes_key = shared_secret[:32]
@@ -197,3 +284,28 @@ class HybridEncryptor:
         cipher = AESGCM(aes_key)
         plaintext = cipher.decrypt(nonce, ciphertext[12:], None)  # Skip nonce from ciphertext
         return plaintext
+
+
+class GCMEncryptStream:
+    """
+    Incremental AES-GCM encryption producing the encrypt() blob layout
+    (nonce + ciphertext + tag).
+    """
+    
+    def __init__(self, aes_key: bytes, metadata: dict):
+        self.metadata = metadata
+        self._header = metadata["nonce"]
+        self._encryptor = Cipher(algorithms.AES(aes_key), modes.GCM(self._header)).encryptor()
+    
+    def update(self, data: bytes) -> bytes:
+        """Encrypt the next plaintext piece; the first output is nonce-prefixed."""
+        out = self._encryptor.update(data)
+        if self._header:
+            out, self._header = self._header + out, b""
+        return out
+    
+    def finalize(self) -> bytes:
+        """Finish encryption and return any remaining output plus the GCM tag."""
+        out = self._header + self._encryptor.finalize() + self._encryptor.tag
+        self._header = b""
+        return out
@@ -0,0 +1,354 @@
+"""
+Batch SHA-256 Kernel
+Hashes every fixed-size chunk of one contiguous buffer in a single
+compiled call (FIPS 180-4 SHA-256, one chunk per parallel iteration).
+
+The core routines are plain Python functions over preallocated arrays so
+the same source is compiled with numba.njit for the CPU and, on demand,
+as numba.cuda device functions for the GPU path (one chunk or tree node
+per thread). If numba is not installed, HAVE_NUMBA is False and callers
+should use hashlib instead.
+"""
+import functools
+import types
+
+import numpy as np
+
+try:
+    from numba import cuda, int64, njit, prange, uint8
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+MASK32 = 0xFFFFFFFF
+
+K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & MASK32
+
+
+def _schedule(block, offset, w):
+    """Expand the 64-byte block at block[offset:] into the 64-word schedule w."""
+    for t in range(16):
+        i = offset + 4 * t
+        # int() widens the uint8 loads so the shifts cannot wrap
+        w[t] = (int(block[i]) << 24) | (int(block[i + 1]) << 16) | (int(block[i + 2]) << 8) | int(block[i + 3])
+    for t in range(16, 64):
+        x = w[t - 15]
+        y = w[t - 2]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+        s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+        w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & MASK32
+
+
+def _rounds(state, w):
+    """Apply the 64 compression rounds for schedule w to state (words in int64)."""
+    a = state[0]
+    b = state[1]
+    c = state[2]
+    d = state[3]
+    e = state[4]
+    f = state[5]
+    g = state[6]
+    h = state[7]
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g & MASK32)
+        t1 = (h + s1 + ch + K[t] + w[t]) & MASK32
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & MASK32
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & MASK32
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & MASK32
+    
+    state[0] = (state[0] + a) & MASK32
+    state[1] = (state[1] + b) & MASK32
+    state[2] = (state[2] + c) & MASK32
+    state[3] = (state[3] + d) & MASK32
+    state[4] = (state[4] + e) & MASK32
+    state[5] = (state[5] + f) & MASK32
+    state[6] = (state[6] + g) & MASK32
+    state[7] = (state[7] + h) & MASK32
+
+
+def _compress(state, block, offset, w):
+    """Run one 64-byte block of block[offset:] through the state."""
+    _schedule(block, offset, w)
+    _rounds(state, w)
+
+
+def _sha256_message(buf, start, end, out, row, state, w, tail, pad_len, pad_w):
+    """
+    Hash buf[start:end] into out[row, :32].
+    
+    state (8 int64), w (64 int64) and tail (128 uint8) are caller-provided
+    scratch so the routine never allocates. If the message is pad_len
+    bytes (a multiple of 64), its padding block is fixed and pad_w holds
+    that block's precomputed schedule, so only the rounds are run for it.
+    """
+    for i in range(8):
+        state[i] = H0[i]
+    
+    # Full blocks straight from the buffer
+    length = end - start
+    full = start + (length // 64) * 64
+    pos = start
+    while pos < full:
+        _compress(state, buf, pos, w)
+        pos += 64
+    
+    if length == pad_len:
+        _rounds(state, pad_w)
+        _digest_out(state, out, row)
+        return
+    
+    # Remainder + 0x80 + zero pad + 64-bit big-endian bit length
+    rem = end - full
+    for i in range(rem):
+        tail[i] = buf[full + i]
+    tail[rem] = 0x80
+    tail_len = 64 if rem < 56 else 128
+    for i in range(rem + 1, tail_len - 8):
+        tail[i] = 0
+    bits = length * 8
+    for i in range(8):
+        tail[tail_len - 1 - i] = (bits >> (8 * i)) & 0xFF
+    _compress(state, tail, 0, w)
+    if tail_len == 128:
+        _compress(state, tail, 64, w)
+    _digest_out(state, out, row)
+
+
+def _digest_out(state, out, row):
+    """Write state as the big-endian digest into out[row, :32]."""
+    for i in range(8):
+        word = state[i]
+        out[row, 4 * i] = (word >> 24) & 0xFF
+        out[row, 4 * i + 1] = (word >> 16) & 0xFF
+        out[row, 4 * i + 2] = (word >> 8) & 0xFF
+        out[row, 4 * i + 3] = word & 0xFF
+
+
+_CORE = ("_rotr", "_schedule", "_rounds", "_compress", "_digest_out", "_sha256_message")
+_PY_CORE = {name: globals()[name] for name in _CORE}  # Uncompiled sources
+
+
+def _compile_core(jit) -> dict:
+    """
+    Compile a private copy of the core routines with jit.
+    
+    Each copy resolves its calls to the other core routines (and K, H0)
+    through the returned namespace, so device functions only call device
+    functions.
+    """
+    namespace = dict(globals())
+    for name in _CORE:
+        fn = _PY_CORE[name]
+        namespace[name] = jit(types.FunctionType(fn.__code__, namespace, name))
+    return namespace
+
+
+if HAVE_NUMBA:
+    _rotr = njit(inline="always")(_rotr)
+    _schedule = njit(_schedule)
+    _rounds = njit(_rounds)
+    _compress = njit(_compress)
+    _digest_out = njit(_digest_out)
+    _sha256_message = njit(_sha256_message)
+    
+    @njit(parallel=True, cache=True)
+    def _sha256_chunks(buf, chunk_size, out, pad_len, pad_w):
+        n = out.shape[0]
+        for row in prange(n):
+            state = np.empty(8, dtype=np.int64)
+            w = np.empty(64, dtype=np.int64)
+            tail = np.empty(128, dtype=np.uint8)
+            start = row * chunk_size
+            end = min(start + chunk_size, buf.shape[0])
+            _sha256_message(buf, start, end, out, row, state, w, tail, pad_len, pad_w)
+
+
+@functools.lru_cache(maxsize=8)
+def _padding_schedule(length: int) -> np.ndarray:
+    """
+    Message schedule of the padding block for a length-byte message.
+    
+    Only defined when length is a multiple of 64, where the padding is
+    a whole block: 0x80, zeros, then the bit length big-endian.
+    """
+    block = np.zeros(64, dtype=np.uint8)
+    block[0] = 0x80
+    block[56:] = np.frombuffer((length * 8).to_bytes(8, "big"), dtype=np.uint8)
+    w = np.empty(64, dtype=np.int64)
+    _schedule(block, 0, w)
+    w.setflags(write=False)
+    return w
+
+
+def sha256_chunks(buf, chunk_size: int = 1024) -> np.ndarray:
+    """
+    SHA-256 of every chunk_size slice of buf.
+    
+    Args:
+        buf: Bytes-like object (bytes, bytearray, memoryview) or uint8 array
+        chunk_size: Size of each chunk in bytes (last chunk may be shorter)
+        
+    Returns:
+        (N, 32) uint8 array of digests, one row per chunk
+        
+    Raises:
+        RuntimeError: If numba is not installed
+    """
+    if not HAVE_NUMBA:
+        raise RuntimeError("sha256_chunks requires the numba package")
+    
+    arr = np.frombuffer(buf, dtype=np.uint8) if not isinstance(buf, np.ndarray) else buf
+    out = np.empty((-(-len(arr) // chunk_size), 32), dtype=np.uint8)
+    # Every chunk but possibly the last shares one fixed padding block
+    if chunk_size % 64 == 0:
+        pad_len, pad_w = chunk_size, _padding_schedule(chunk_size)
+    else:
+        pad_len, pad_w = -1, _padding_schedule(0)
+    _sha256_chunks(np.ascontiguousarray(arr), chunk_size, out, pad_len, pad_w)
+    return out
+
+
+CUDA_THREADS = 128  # Threads per block for the CUDA kernels
+
+
+def cuda_available() -> bool:
+    """True if numba is installed and can see a CUDA device (or the simulator)."""
+    return HAVE_NUMBA and cuda.is_available()
+
+
+@functools.lru_cache(maxsize=None)
+def _cuda_kernels() -> tuple:
+    """Compile the core as CUDA device functions and build the launch kernels."""
+    sha256_message = _compile_core(cuda.jit(device=True))["_sha256_message"]
+    
+    @cuda.jit
+    def leaf_kernel(buf, chunk_size, out, pad_len, pad_w):
+        row = cuda.grid(1)
+        if row < out.shape[0]:
+            state = cuda.local.array(8, int64)
+            w = cuda.local.array(64, int64)
+            tail = cuda.local.array(128, uint8)
+            start = row * chunk_size
+            end = min(start + chunk_size, buf.shape[0])
+            sha256_message(buf, start, end, out, row, state, w, tail, pad_len, pad_w)
+    
+    @cuda.jit
+    def level_kernel(level, out, pad_w):
+        # level is the flat (n * 32) previous level; pair i is bytes [64i, 64i + 64)
+        row = cuda.grid(1)
+        n = level.shape[0] // 32
+        if row < n // 2:
+            state = cuda.local.array(8, int64)
+            w = cuda.local.array(64, int64)
+            tail = cuda.local.array(128, uint8)
+            sha256_message(level, 64 * row, 64 * row + 64, out, row, state, w, tail, 64, pad_w)
+        elif row < out.shape[0]:
+            # Odd node at the end of the level is promoted unchanged
+            for i in range(32):
+                out[row, i] = level[64 * row + i]
+    
+    return leaf_kernel, level_kernel
+
+
+def _blocks(n: int) -> int:
+    return max(1, -(-n // CUDA_THREADS))
+
+
+def sha256_chunks_cuda(buf, chunk_size: int = 1024) -> np.ndarray:
+    """
+    GPU version of sha256_chunks(): one CUDA thread per chunk.
+    
+    Args:
+        buf: Bytes-like object (bytes, bytearray, memoryview) or uint8 array
+        chunk_size: Size of each chunk in bytes (last chunk may be shorter)
+        
+    Returns:
+        (N, 32) uint8 array of digests copied back to the host
+        
+    Raises:
+        RuntimeError: If numba or a CUDA device is not available
+    """
+    if not cuda_available():
+        raise RuntimeError("sha256_chunks_cuda requires numba and a CUDA device")
+    
+    leaf_kernel, _ = _cuda_kernels()
+    arr = np.frombuffer(buf, dtype=np.uint8) if not isinstance(buf, np.ndarray) else buf
+    n = -(-len(arr) // chunk_size)
+    if n == 0:
+        return np.empty((0, 32), dtype=np.uint8)
+    if chunk_size % 64 == 0:
+        pad_len, pad_w = chunk_size, _padding_schedule(chunk_size)
+    else:
+        pad_len, pad_w = -1, _padding_schedule(0)
+    
+    d_out = cuda.device_array((n, 32), dtype=np.uint8)
+    leaf_kernel[_blocks(n), CUDA_THREADS](cuda.to_device(np.ascontiguousarray(arr)), chunk_size,
+                                          d_out, pad_len, cuda.to_device(pad_w))
+    return d_out.copy_to_host()
+
+
+def merkle_fold_cuda(leaves: np.ndarray, keep_height: int = 0) -> tuple:
+    """
+    Reduce a Merkle tree on the GPU, one kernel launch per level.
+    
+    Levels stay in device memory; only the root and the level at
+    keep_height are copied back. Pairing and odd-node promotion match
+    BatchZKP's CPU tree.
+    
+    Args:
+        leaves: Concatenated 32-byte leaf digests (bytes-like or uint8 array)
+        keep_height: Height of the level to return alongside the root
+        
+    Returns:
+        (root bytes, (M, 32) uint8 array of the level at keep_height)
+        
+    Raises:
+        RuntimeError: If numba or a CUDA device is not available
+    """
+    if not cuda_available():
+        raise RuntimeError("merkle_fold_cuda requires numba and a CUDA device")
+    
+    _, level_kernel = _cuda_kernels()
+    leaves = np.frombuffer(leaves, dtype=np.uint8) if not isinstance(leaves, np.ndarray) else leaves
+    leaves = np.ascontiguousarray(leaves).reshape(-1, 32)
+    pad_w = cuda.to_device(_padding_schedule(64))
+    d_level = cuda.to_device(leaves.reshape(-1))
+    kept = leaves
+    n = leaves.shape[0]
+    height = 0
+    while n > 1:
+        m = (n + 1) // 2
+        d_out = cuda.device_array((m, 32), dtype=np.uint8)
+        level_kernel[_blocks(m), CUDA_THREADS](d_level, d_out, pad_w)
+        height += 1
+        if height == keep_height:
+            kept = d_out.copy_to_host()
+        d_level = d_out.reshape(m * 32)
+        n = m
+    return d_level.copy_to_host()[:32].tobytes(), kept
@@ -8,8 +8,45 @@ aggregated into a compressed proof structure (Ring-LWE based simulation).
 NOT a cryptographic ZKP primitive - for demos/research only.
 """
 import hashlib
-import json
+import os
 import struct
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import blake3
+    HAVE_BLAKE3 = True
+except ImportError:
+    HAVE_BLAKE3 = False
+
+
+def sha256_many(buffers) -> list:
+    """
+    Hash many independent buffers in one call.
+    
+    Single entry point for batch hashing so a multi-buffer (SIMD-lane)
+    backend can be dropped in without touching callers. The default
+    backend is hashlib, one buffer at a time.
+    
+    Args:
+        buffers: Iterable of bytes-like objects
+        
+    Returns:
+        List of raw 32-byte SHA-256 digests, in input order
+    """
+    sha256 = hashlib.sha256
+    return [sha256(b).digest() for b in buffers]
+
+
+def blake3_many(buffers) -> list:
+    """sha256_many() counterpart returning raw 32-byte BLAKE3 digests (requires blake3)."""
+    hasher = blake3.blake3
+    return [hasher(b).digest() for b in buffers]
+
+
+# Commitment hash per algorithm name: (single-buffer constructor, batch function)
+_HASHES = {"sha256": (hashlib.sha256, sha256_many)}
+if HAVE_BLAKE3:
+    _HASHES["blake3"] = (blake3.blake3, blake3_many)
 
 
 class BatchZKP:
@@ -24,32 +61,240 @@ class BatchZKP:
     """
     
     CHUNK_SIZE = 1024  # Default chunk size in bytes
+    # hashlib only releases the GIL for buffers of at least 2 KiB; smaller
+    # chunks are hashed serially since threads would just take turns.
+    PARALLEL_MIN_CHUNK = 2048
+    PARALLEL_MIN_CHUNKS = 64  # Below this, thread dispatch costs more than it saves
+    
+    # Proof layout: magic | num_commitments (u32 LE) | tree depth (u8)
+    #               | cache depth L (u8) | hash id (u8) | root[32]
+    #               | layer L below root[<=2**L * 32] | first refs[<=3 * 32]
+    PROOF_MAGIC = b"BZKP"  # Implies proof_type PROOF_TYPE
+    PROOF_TYPE = "compressed_batch_merkle_lwesim"
+    PROOF_HEADER = struct.Struct("<4sIBBB32s")
+    HASH_ALGORITHMS = ("sha256", "blake3")  # Index is the header hash id
+    CACHE_DEPTH = 2  # Default cached layer: up to 4 nodes
+    NUM_REFS = 3  # Leading commitments stored for verification reference
+    DIGEST_SIZE = 32
+    
+    BACKENDS = ("hashlib", "numba", "cuda")
+    GPU_MIN_BYTES = 8 * 1024 * 1024  # Below this, host/device copies outweigh the GPU
+    
+    def __init__(self, max_workers: int = None, hash_cache_size: int = 0, backend: str = "hashlib",
+                 hash_alg: str = "sha256"):
+        """
+        Initialize batch ZKP.
+        
+        Args:
+            max_workers: Hashing threads for large buffers (default: CPU count)
+            hash_cache_size: Max distinct chunks whose digests are kept so
+                             repeated chunks skip hashing (0 disables; only
+                             pays off on repetitive data, since a miss costs
+                             a copy and dict insert on top of the hash;
+                             hashing then stays on one thread)
+            backend: "hashlib", or "numba" to hash whole buffers in the
+                     compiled kernel from crypto.sha256_kernel (worth it on
+                     many-core hosts without SHA extensions; hashlib is
+                     faster where OpenSSL uses SHA-NI), or "cuda" to hash
+                     buffers and build Merkle trees of at least
+                     GPU_MIN_BYTES on the GPU via numba.cuda (smaller
+                     inputs stay on hashlib)
+            hash_alg: Commitment hash, "sha256" or "blake3" (needs the
+                      blake3 package and the hashlib backend; only faster
+                      than SHA-NI SHA-256 for chunks of 4 KiB and up). The
+                      choice is recorded in each proof, so verify() follows
+                      the proof rather than this setting
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}. Must be one of {'/'.join(self.BACKENDS)}")
+        if hash_alg not in self.HASH_ALGORITHMS:
+            raise ValueError(f"Invalid hash_alg: {hash_alg}. Must be one of {'/'.join(self.HASH_ALGORITHMS)}")
+        if hash_alg == "blake3" and not HAVE_BLAKE3:
+            print("[BatchZKP] blake3 not found, falling back to SHA-256")
+            hash_alg = "sha256"
+        if hash_alg != "sha256" and backend != "hashlib":
+            raise ValueError(f"The {backend} backend only supports SHA-256 commitments")
+        
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
+        self._sha256_chunks = None
+        self._gpu_chunks = None
+        self._gpu_fold = None
+        
+        # Kernel module pulls in numba, so only import it when asked for
+        if backend == "numba":
+            from crypto.sha256_kernel import HAVE_NUMBA, sha256_chunks
+            if HAVE_NUMBA:
+                self._sha256_chunks = sha256_chunks
+            else:
+                print("[BatchZKP] numba not found, falling back to hashlib")
+                backend = "hashlib"
+        elif backend == "cuda":
+            from crypto.sha256_kernel import cuda_available, merkle_fold_cuda, sha256_chunks_cuda
+            if cuda_available():
+                self._gpu_chunks = sha256_chunks_cuda
+                self._gpu_fold = merkle_fold_cuda
+            else:
+                print("[BatchZKP] CUDA not available, falling back to hashlib")
+                backend = "hashlib"
+        self.backend = backend
+        self.hash_alg = hash_alg
+        self._hash, self._hash_many = _HASHES[hash_alg]
+        self.hash_cache_size = hash_cache_size
+        self._hash_cache = {}  # chunk bytes -> digest, oldest first
+    
+    def _hash_chunks(self, chunks) -> list:
+        """Batch-hash chunks, consulting the bounded chunk-content cache if enabled."""
+        if not self.hash_cache_size:
+            return self._hash_many(chunks)
+        
+        # Keyed by content, not id() or a short fingerprint: ids are reused
+        # after GC and fingerprints can collide, either would return a
+        # wrong commitment
+        cache = self._hash_cache
+        hasher = self._hash
+        digests = []
+        for chunk in chunks:
+            key = bytes(chunk)
+            digest = cache.get(key)
+            if digest is None:
+                digest = hasher(key).digest()
+                if len(cache) >= self.hash_cache_size:
+                    del cache[next(iter(cache))]
+                cache[key] = digest
+            digests.append(digest)
+        return digests
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Lazily create the hashing thread pool, reused across calls."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+    
+    def _use_pool(self, num_chunks: int, chunk_size: int) -> bool:
+        """
+        Whether threads can actually hash these chunks concurrently.
+        
+        Never with hash_cache_size set: the cache is not shared across
+        threads, so cached calls stay on the serial path that consults it.
+        """
+        return (not self.hash_cache_size and self.max_workers > 1 and chunk_size >= self.PARALLEL_MIN_CHUNK
+                and num_chunks >= self.PARALLEL_MIN_CHUNKS)
     
-    def commitments(self, chunks: list) -> list:
+    def _hash_partitioned(self, chunks: list) -> list:
+        """
+        Hash chunks on the pool as max_workers contiguous ranges.
+        
+        One task per range keeps submission overhead independent of the
+        chunk count; results are concatenated back in order.
+        """
+        step = -(-len(chunks) // self.max_workers)
+        pool = self._get_pool()
+        futures = [pool.submit(self._hash_many, chunks[i:i + step]) for i in range(0, len(chunks), step)]
+        digests = []
+        for future in futures:
+            digests += future.result()
+        return digests
+    
+    def commitments(self, chunks, chunk_size: int = CHUNK_SIZE) -> list:
         """
         Compute hash commitments for data chunks.
         
         Args:
-            chunks: List of byte chunks
+            chunks: List of byte chunks, or a single bytes-like buffer
+                    (e.g. memoryview) that is sliced into chunk_size views
+                    without copying
+            chunk_size: Chunk size used when chunks is a single buffer
             
         Returns:
-            List of SHA-256 commitments (hex strings)
+            List of hash_alg commitments (raw 32-byte digests)
         """
-        commitments = []
-        for chunk in chunks:
-            commitment = hashlib.sha256(chunk).hexdigest()
-            commitments.append(commitment)
-        return commitments
+        if isinstance(chunks, (bytes, bytearray, memoryview)):
+            return self.commitments_from_buffer(chunks, chunk_size)
+        
+        chunks = list(chunks)
+        if chunks and self._use_pool(len(chunks), len(chunks[0])):
+            return self._hash_partitioned(chunks)
+        return self._hash_chunks(chunks)
+    
+    def commitments_from_buffer(self, buf, chunk_size: int = CHUNK_SIZE) -> list:
+        """
+        Compute hash commitments over fixed-size slices of one buffer.
+        
+        Slices are memoryviews into buf, so no per-chunk bytes copies are
+        made before hashing. Large buffers with chunks big enough for
+        hashlib to release the GIL are split into one range per worker on
+        the shared thread pool.
+        With the numba backend (or cuda, for buffers of at least
+        GPU_MIN_BYTES) the whole buffer is hashed in one kernel call
+        instead.
+        
+        Args:
+            buf: Bytes-like object (bytes, bytearray, memoryview)
+            chunk_size: Size of each chunk in bytes
+            
+        Returns:
+            List of hash_alg commitments (raw 32-byte digests)
+        """
+        mv = memoryview(buf)
+        if self._sha256_chunks is not None:
+            return self._split_digests(self._sha256_chunks(buf, chunk_size).tobytes())
+        if self._gpu_chunks is not None and mv.nbytes >= self.GPU_MIN_BYTES:
+            return self._split_digests(self._gpu_chunks(buf, chunk_size).tobytes())
+        
+        offsets = range(0, len(mv), chunk_size)
+        if self._use_pool(len(offsets), chunk_size):
+            return self._hash_partitioned([mv[i:i + chunk_size] for i in offsets])
+        return self._hash_chunks(mv[i:i + chunk_size] for i in offsets)
+    
+    def _commitments_for(self, chunks, hash_alg: str) -> list:
+        """
+        commitments() under hash_alg, which may differ from this instance's.
+        
+        Foreign algorithms skip the kernels, pool and cache and hash serially.
+        """
+        if hash_alg == self.hash_alg:
+            return self.commitments(chunks)
+        
+        hash_many = _HASHES[hash_alg][1]
+        if isinstance(chunks, (bytes, bytearray, memoryview)):
+            mv = memoryview(chunks)
+            return hash_many(mv[i:i + self.CHUNK_SIZE] for i in range(0, len(mv), self.CHUNK_SIZE))
+        return hash_many(chunks)
+    
+    def _split_digests(self, digests: bytes) -> list:
+        """Cut concatenated kernel output into per-chunk digests."""
+        return [digests[i:i + self.DIGEST_SIZE] for i in range(0, len(digests), self.DIGEST_SIZE)]
+    
+    def commitment_stream(self, chunk_size: int = CHUNK_SIZE) -> "CommitmentStream":
+        """
+        Create an incremental committer for data that arrives in pieces.
+        
+        Feeding a byte stream through update() yields the same commitments
+        as commitments_from_buffer() over the concatenated bytes.
+        
+        Args:
+            chunk_size: Size of each chunk in bytes
+            
+        Returns:
+            CommitmentStream bound to this BatchZKP
+        """
+        return CommitmentStream(self, chunk_size)
     
-    def make_proof(self, commitments: list) -> bytes:
+    def make_proof(self, commitments: list, cache_depth: int = None) -> bytes:
         """
         Generate compressed batch proof from commitments.
         
         Aggregates multiple commitments into a single compressed proof
-        using Merkle tree-like aggregation (simulated Ring-LWE structure).
+        via the root of a binary Merkle tree over the commitments
+        (simulated Ring-LWE structure). The tree layer cache_depth levels
+        below the root is stored too, so single-chunk audits only need a
+        sibling path up to that layer.
         
         Args:
-            commitments: List of hex string commitments
+            commitments: List of raw 32-byte digest commitments
+            cache_depth: Levels below the root to cache (default:
+                         CACHE_DEPTH, capped at the tree depth)
             
         Returns:
             Serialized compressed proof (bytes)
@@ -57,31 +302,200 @@ class BatchZKP:
         if not commitments:
             return b""
         
-        # Stage 1: Hash commitments into a single root
-        combined = "".join(commitments)
-        root = hashlib.sha256(combined.encode()).hexdigest()
+        # Stage 1: Hash commitments into a single Merkle root
+        depth = self._merkle_depth(len(commitments))
+        if cache_depth is None:
+            cache_depth = self.CACHE_DEPTH
+        cache_depth = min(cache_depth, depth)
+        root, layer = self._merkle_fold(commitments, depth - cache_depth)
         
         # Stage 2: Simulate Ring-LWE aggregation (compress proof)
-        # Use root hash + number of commitments to create compressed representation
-        proof_data = {
-            "root": root,
-            "num_commitments": len(commitments),
-            "commitment_hashes": commitments[:3],  # Store first 3 for verification reference
-            "proof_type": "compressed_batch_merkle_lwesim"
-        }
+        # Fixed header (magic, count, depth, cache depth, hash id, root), the
+        # cached layer, then the first few raw commitments for verification reference
+        header = self.PROOF_HEADER.pack(self.PROOF_MAGIC, len(commitments), depth, cache_depth,
+                                        self.HASH_ALGORITHMS.index(self.hash_alg), root)
+        return (header + b"".join(layer)
+                + b"".join(commitments[:self.NUM_REFS]))
+    
+    def _parse_proof(self, proof: bytes) -> tuple:
+        """
+        Split a serialized proof into its fields.
+        
+        Returns:
+            (num_commitments, depth, cache_depth, hash_alg, root, cached_layer,
+            refs); cached_layer is a list of digests, refs the raw trailing bytes
+            
+        Raises:
+            ValueError: If the proof is malformed or its hash is unavailable
+        """
+        try:
+            magic, num_commitments, depth, cache_depth, hash_id, root = self.PROOF_HEADER.unpack_from(proof, 0)
+        except struct.error as e:
+            raise ValueError(f"Truncated proof header: {e}") from None
+        if magic != self.PROOF_MAGIC:
+            raise ValueError("Not a BatchZKP proof")
+        if cache_depth > depth:
+            raise ValueError("Cache depth exceeds tree depth")
+        if hash_id >= len(self.HASH_ALGORITHMS):
+            raise ValueError(f"Unknown hash id {hash_id}")
+        hash_alg = self.HASH_ALGORITHMS[hash_id]
+        if hash_alg not in _HASHES:
+            raise ValueError(f"Proof uses {hash_alg}, which is not installed")
+        
+        # Node count at height h is ceil(n / 2**h) since odd nodes are promoted
+        layer_len = -(-num_commitments // (1 << (depth - cache_depth)))
+        start = self.PROOF_HEADER.size
+        end = start + layer_len * self.DIGEST_SIZE
+        if len(proof) < end:
+            raise ValueError("Truncated cached layer")
+        layer = [proof[i:i + self.DIGEST_SIZE] for i in range(start, end, self.DIGEST_SIZE)]
+        return num_commitments, depth, cache_depth, hash_alg, root, layer, proof[end:]
+    
+    @staticmethod
+    def _merkle_depth(num_leaves: int) -> int:
+        """Tree height over num_leaves leaves (odd nodes are promoted)."""
+        return (num_leaves - 1).bit_length()
+    
+    @staticmethod
+    def _merkle_parent_level(level: list, hash_many=sha256_many) -> list:
+        """
+        Hash one Merkle level into the next.
+        
+        Adjacent nodes are concatenated and the whole level is hashed in
+        one hash_many() batch; an odd node at the end is promoted
+        unchanged.
+        """
+        parents = hash_many(level[i] + level[i + 1] for i in range(0, len(level) - 1, 2))
+        if len(level) % 2:
+            parents.append(level[-1])
+        return parents
+    
+    def _merkle_fold(self, commitments: list, keep_height: int = 0, hash_alg: str = None) -> tuple:
+        """
+        Reduce commitments to the Merkle root holding one level at a time.
+        
+        With the cuda backend, SHA-256 trees over at least GPU_MIN_BYTES
+        of chunks are reduced on the device and only the root and kept
+        level return.
+        
+        Args:
+            commitments: Leaf digests
+            keep_height: Height of the level to return alongside the root
+            hash_alg: Node hash (default: this instance's hash_alg)
+            
+        Returns:
+            (root, level at keep_height)
+        """
+        hash_alg = hash_alg or self.hash_alg
+        if (self._gpu_fold is not None and hash_alg == "sha256"
+                and len(commitments) * self.CHUNK_SIZE >= self.GPU_MIN_BYTES):
+            root, kept = self._gpu_fold(b"".join(commitments), keep_height)
+            return root, self._split_digests(kept.tobytes())
+        
+        hash_many = _HASHES[hash_alg][1]
+        level = kept = commitments
+        height = 0
+        while len(level) > 1:
+            level = self._merkle_parent_level(level, hash_many)
+            height += 1
+            if height == keep_height:
+                kept = level
+        return level[0], kept
+    
+    def _merkle_levels(self, commitments: list) -> list:
+        """
+        Build and keep every level of the Merkle tree (for sibling paths).
+        
+        Returns:
+            List of levels, leaves first; the last level holds only the root
+        """
+        levels = [commitments]
+        while len(levels[-1]) > 1:
+            levels.append(self._merkle_parent_level(levels[-1], self._hash_many))
+        return levels
+    
+    def merkle_path(self, commitments: list, index: int, cache_depth: int = None) -> list:
+        """
+        Sibling hashes needed to recompute the cached layer from one chunk.
+        
+        Args:
+            commitments: Full list of commitments the proof was built from
+            index: Position of the chunk
+            cache_depth: Same value passed to make_proof() (default:
+                         CACHE_DEPTH); 0 gives a full path to the root
+            
+        Returns:
+            List of 32-byte sibling digests, leaf level first (levels where
+            the node was promoted contribute no sibling)
+        """
+        if not 0 <= index < len(commitments):
+            raise IndexError(f"Chunk index {index} out of range")
+        if cache_depth is None:
+            cache_depth = self.CACHE_DEPTH
         
-        # Serialize to JSON, then to bytes
-        proof_json = json.dumps(proof_data)
-        proof_bytes = proof_json.encode()
+        levels = self._merkle_levels(commitments)
+        depth = len(levels) - 1
+        path = []
+        for level in levels[:depth - min(cache_depth, depth)]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(level[sibling])
+            index //= 2
+        return path
+    
+    def verify_chunk(self, index: int, chunk: bytes, sibling_path: list, proof: bytes) -> bool:
+        """
+        Verify a single chunk against a proof with O(log N) hashes.
+        
+        The chunk is hashed up to the proof's cached layer, compared with
+        the cached node at index >> (depth - cache_depth), and the cached
+        layer is checked against the root.
+        
+        Args:
+            index: Position of the chunk in the original data
+            chunk: Chunk bytes
+            sibling_path: Output of merkle_path() for this index
+            proof: Serialized proof bytes
+            
+        Returns:
+            True if the chunk is part of the committed data, False otherwise
+        """
+        try:
+            num_commitments, depth, cache_depth, hash_alg, root, layer, _ = self._parse_proof(proof)
+        except ValueError:
+            return False
+        if not 0 <= index < num_commitments:
+            return False
         
-        return proof_bytes
+        hasher = _HASHES[hash_alg][0]
+        node = hasher(chunk).digest()
+        siblings = iter(sibling_path)
+        size = num_commitments
+        for _ in range(depth - cache_depth):
+            if index % 2 or index + 1 < size:
+                sibling = next(siblings, None)
+                if sibling is None:
+                    return False
+                pair = sibling + node if index % 2 else node + sibling
+                node = hasher(pair).digest()
+            index //= 2
+            size = (size + 1) // 2
+        if next(siblings, None) is not None or layer[index] != node:
+            return False
+        return self._merkle_fold(layer, hash_alg=hash_alg)[0] == root
     
     def verify(self, chunks: list, proof: bytes) -> bool:
         """
         Verify compressed batch proof against original chunks.
         
+        Header fields are checked before any chunk is hashed: a wrong
+        chunk count or depth rejects without hashing, and the first
+        NUM_REFS chunks are hashed against the stored references before
+        the full recomputation.
+        
         Args:
-            chunks: List of original data chunks
+            chunks: List of original data chunks, or the original buffer
+                    (chunked as in commitments())
             proof: Serialized proof bytes
             
         Returns:
@@ -90,34 +504,37 @@ class BatchZKP:
         if not proof or not chunks:
             return False
         
+        # Parse fixed header and cached layer; reference commitments follow
         try:
-            # Deserialize proof
-            proof_json = proof.decode()
-            proof_data = json.loads(proof_json)
-            
-            # Recompute commitments
-            commitments = self.commitments(chunks)
-            
-            # Recompute root
-            combined = "".join(commitments)
-            recomputed_root = hashlib.sha256(combined.encode()).hexdigest()
-            
-            # Verify root matches
-            if recomputed_root != proof_data["root"]:
-                return False
-            
-            # Verify number of commitments matches
-            if len(commitments) != proof_data["num_commitments"]:
-                return False
-            
-            # Verify stored reference commitments match
-            if proof_data.get("commitment_hashes", []) != commitments[:3]:
-                return False
-            
-            return True
-        except Exception as e:
-            print(f"[BatchZKP] Verification error: {e}")
+            num_commitments, depth, cache_depth, hash_alg, root, layer, refs = self._parse_proof(proof)
+        except ValueError:
+            return False
+        
+        # Verify number of chunks and depth match before hashing anything
+        if isinstance(chunks, (bytes, bytearray, memoryview)):
+            mv = memoryview(chunks)
+            num_chunks = -(-mv.nbytes // self.CHUNK_SIZE)
+            leading = [mv[i:i + self.CHUNK_SIZE]
+                       for i in range(0, min(mv.nbytes, self.NUM_REFS * self.CHUNK_SIZE), self.CHUNK_SIZE)]
+        else:
+            chunks = list(chunks)
+            num_chunks = len(chunks)
+            leading = chunks[:self.NUM_REFS]
+        if num_chunks != num_commitments or self._merkle_depth(num_chunks) != depth:
+            return False
+        
+        # Verify stored reference commitments match (at most NUM_REFS hashes)
+        if refs != b"".join(_HASHES[hash_alg][1](leading)):
             return False
+        
+        # Recompute commitments with the hash the proof was made with
+        commitments = self._commitments_for(chunks, hash_alg)
+        
+        # Recompute Merkle tree; verify cached layer and root match
+        recomputed_root, recomputed_layer = self._merkle_fold(commitments, depth - cache_depth, hash_alg)
+        if recomputed_layer != layer or recomputed_root != root:
+            return False
+        return True
     
     def batch_commit(self, data_chunks: list) -> tuple:
         """
@@ -138,21 +555,100 @@ class BatchZKP:
         """
         Extract and report proof size information.
         
+        Only the fixed header is read; anything that does not start with a
+        BatchZKP header reports just its length.
+        
         Args:
             proof: Serialized proof bytes
             
         Returns:
             Dictionary with proof size details
         """
-        try:
-            proof_json = proof.decode()
-            proof_data = json.loads(proof_json)
-            
-            return {
-                "proof_bytes": len(proof),
-                "num_commitments": proof_data.get("num_commitments", 0),
-                "proof_type": proof_data.get("proof_type", "unknown"),
-                "compression_ratio": len(proof) / (32 * proof_data.get("num_commitments", 1))  # Bytes per commitment
-            }
-        except:
+        if len(proof) < self.PROOF_HEADER.size or proof[:4] != self.PROOF_MAGIC:
             return {"proof_bytes": len(proof)}
+        
+        _, num_commitments, depth, cache_depth, hash_id, _ = self.PROOF_HEADER.unpack_from(proof, 0)
+        return {
+            "proof_bytes": len(proof),
+            "num_commitments": num_commitments,
+            "tree_depth": depth,
+            "cache_depth": cache_depth,
+            "hash_alg": self.HASH_ALGORITHMS[hash_id] if hash_id < len(self.HASH_ALGORITHMS) else "unknown",
+            "proof_type": self.PROOF_TYPE,
+            "compression_ratio": len(proof) / (self.DIGEST_SIZE * max(num_commitments, 1))  # Bytes per commitment
+        }
+    
+    def get_proof_size_info_batch(self, proofs: list):
+        """
+        get_proof_size_info() for many proofs as one NumPy structured array.
+        
+        Headers are decoded in a single frombuffer() over their
+        concatenation, so a benchmark table can go straight to
+        pandas.DataFrame(...) without a per-proof Python loop. Proofs
+        without a BatchZKP header get zero counts and "unknown" hash_alg.
+        
+        Args:
+            proofs: List of serialized proofs
+            
+        Returns:
+            Structured array with fields proof_bytes, num_commitments,
+            tree_depth, cache_depth, hash_alg, compression_ratio
+        """
+        import numpy as np  # Only batch reporting needs numpy
+        
+        size = self.PROOF_HEADER.size
+        header_dtype = np.dtype([("magic", "S4"), ("num_commitments", "<u4"), ("tree_depth", "u1"),
+                                 ("cache_depth", "u1"), ("hash_id", "u1"), ("root", "V32")])
+        headers = np.frombuffer(b"".join(bytes(p[:size]).ljust(size, b"\0") for p in proofs), dtype=header_dtype)
+        lengths = np.fromiter(map(len, proofs), dtype=np.int64, count=len(proofs))
+        valid = (headers["magic"] == self.PROOF_MAGIC) & (lengths >= size)
+        
+        info = np.zeros(len(proofs), dtype=[("proof_bytes", "i8"), ("num_commitments", "u4"), ("tree_depth", "u1"),
+                                            ("cache_depth", "u1"), ("hash_alg", "U8"), ("compression_ratio", "f8")])
+        info["proof_bytes"] = lengths
+        for field in ("num_commitments", "tree_depth", "cache_depth"):
+            info[field] = np.where(valid, headers[field], 0)
+        names = np.array(self.HASH_ALGORITHMS + ("unknown",))
+        info["hash_alg"] = names[np.where(valid, np.minimum(headers["hash_id"], len(self.HASH_ALGORITHMS)),
+                                          len(self.HASH_ALGORITHMS))]
+        info["compression_ratio"] = lengths / (self.DIGEST_SIZE * np.maximum(info["num_commitments"], 1))
+        return info
+
+
+class CommitmentStream:
+    """
+    Incremental chunk commitments over a byte stream.
+    
+    Buffers at most one partial chunk between update() calls; full chunks
+    are hashed as they arrive.
+    """
+    
+    def __init__(self, zkp: BatchZKP, chunk_size: int = BatchZKP.CHUNK_SIZE):
+        self._zkp = zkp
+        self.chunk_size = chunk_size
+        self._pending = bytearray()
+        self._commitments = []
+    
+    def update(self, data: bytes):
+        """Commit every chunk completed by data; keep the remainder pending."""
+        mv = memoryview(data)
+        if self._pending:
+            take = self.chunk_size - len(self._pending)
+            self._pending += mv[:take]
+            mv = mv[take:]
+            if len(self._pending) < self.chunk_size:
+                return
+            self._commitments += self._zkp.commitments_from_buffer(self._pending, self.chunk_size)
+            self._pending.clear()
+        
+        full = len(mv) - len(mv) % self.chunk_size
+        if full:
+            self._commitments += self._zkp.commitments_from_buffer(mv[:full], self.chunk_size)
+        self._pending += mv[full:]
+    
+    def finalize(self) -> list:
+        """Commit the trailing partial chunk and return all commitments."""
+        if self._pending:
+            self._commitments += self._zkp.commitments_from_buffer(self._pending, self.chunk_size)
+            self._pending.clear()
+        return self._commitments
@@ -1,8 +1,9 @@
 import streamlit as st
 import time
 import os
+from pathlib import Path
 from crypto.compression import Compressor
-from crypto.hybrid import HybridEncryptor
+from crypto.hybrid import HybridEncryptor, wire_metadata
 from crypto.zkp import BatchZKP
 from cloud.uploader import CloudUploader
 
@@ -11,9 +12,46 @@ st.set_page_config(page_title="PQ Cloud Migration Demo", layout="wide")
 st.title("Post-Quantum Secure Cloud Migration — Demo (Streamlit)")
 st.markdown("Upload a file, choose sensitivity, and run the hybrid pipeline (compression → proof → encrypt). Uses a simulated PQ KEM if `pyoqs`/`liboqs` isn't installed.")
 
-uploader = CloudUploader()
-compressor = Compressor()
-zkp = BatchZKP()
+
+# Built once per server process and shared across reruns/sessions, so
+# warm state (thread pool, hash cache, compiled kernels, keypair) survives
+@st.cache_resource
+def get_uploader():
+    return CloudUploader()
+
+
+@st.cache_resource
+def get_compressor():
+    return Compressor()
+
+
+@st.cache_resource
+def get_zkp():
+    # hashlib by default; opt into the GPU with PQ_ZKP_BACKEND=cuda (used only
+    # for inputs >= GPU_MIN_BYTES, falls back to hashlib without CUDA)
+    return BatchZKP(backend=os.environ.get("PQ_ZKP_BACKEND", "hashlib"))
+
+
+@st.cache_resource
+def get_encryptor():
+    """HybridEncryptor plus one demo KEM keypair reused for every run."""
+    he = HybridEncryptor()
+    pub, priv = he.generate_kem_keypair()
+    return he, pub, priv
+
+
+@st.cache_resource
+def get_cloud_dir():
+    """Local cloud folder, created once instead of on every pipeline run."""
+    cloud_dir = Path("cloud")
+    cloud_dir.mkdir(exist_ok=True)
+    return cloud_dir
+
+
+uploader = get_uploader()
+compressor = get_compressor()
+zkp = get_zkp()
+cloud_dir = get_cloud_dir()
 
 uploaded = st.file_uploader("Choose a file to upload", type=None)
 sensitivity = st.selectbox("Sensitivity level", ["low", "medium", "high"], index=1)
@@ -22,67 +60,79 @@ if uploaded is not None:
     data = uploaded.read()
     st.info(f"Loaded {uploaded.name} — {len(data)} bytes")
 
+    run_key = (uploaded.file_id, sensitivity)
     if st.button("Run pipeline"):
-        t0 = time.time()
+        t0 = time.perf_counter_ns()
         compressed = compressor.compress(data, sensitivity)
-        t1 = time.time()
-        chunks = [compressed[i:i+1024] for i in range(0, len(compressed), 1024)]
-        commitments = zkp.commitments(chunks)
+        t1 = time.perf_counter_ns()
+        commitments = zkp.commitments_from_buffer(compressed)
         proof = zkp.make_proof(commitments)
-        t2 = time.time()
+        t2 = time.perf_counter_ns()
 
         # Encryption (uses HybridEncryptor; real pyoqs if installed otherwise simulated fallback)
-        he = HybridEncryptor()
-        pub, priv = he.generate_kem_keypair()
-        t3 = time.time()
+        he, pub, priv = get_encryptor()
+        t3 = time.perf_counter_ns()
         enc_blob, metadata = he.encrypt(compressed, pub)
-        t4 = time.time()
+        t4 = time.perf_counter_ns()
 
         # Save to local cloud simulation
-        os.makedirs("cloud", exist_ok=True)
-        enc_path = os.path.join("cloud", uploaded.name + ".enc")
-        proof_path = os.path.join("cloud", uploaded.name + ".proof")
-        with open(enc_path, "wb") as f:
-            f.write(enc_blob)
-        with open(proof_path, "wb") as f:
-            f.write(proof)
+        enc_path = os.path.join(cloud_dir, uploaded.name + ".enc")
+        proof_path = os.path.join(cloud_dir, uploaded.name + ".proof")
+        Path(enc_path).write_bytes(enc_blob)
+        Path(proof_path).write_bytes(proof)
+
+        # Kept in session state so the widgets below (e.g. the verification
+        # checkbox) still have this run on the reruns they trigger
+        st.session_state["run"] = {
+            "key": run_key,
+            "compressed": compressed,
+            "proof": proof,
+            "enc_blob": enc_blob,
+            "metadata": metadata,
+            "enc_path": enc_path,
+            "proof_path": proof_path,
+            "report": {
+                "timings": {
+                    "compress": round((t1-t0) / 1e9, 6),
+                    "proof": round((t2-t1) / 1e9, 6),
+                    "enc_setup": round((t3-t2) / 1e9, 6),
+                    "encrypt": round((t4-t3) / 1e9, 6),
+                },
+                "sizes": {
+                    "input": len(data),
+                    "compressed": len(compressed),
+                    "enc_blob": len(enc_blob),
+                    "proof": len(proof)
+                },
+                "metadata": wire_metadata(metadata)
+            }
+        }
 
+    run = st.session_state.get("run")
+    if run is not None and run["key"] == run_key:
         # Show results
         st.success("Pipeline finished")
-        st.write({
-            "timings": {
-                "compress": round(t1-t0, 6),
-                "proof": round(t2-t1, 6),
-                "enc_setup": round(t3-t2, 6),
-                "encrypt": round(t4-t3, 6),
-            },
-            "sizes": {
-                "input": len(data),
-                "compressed": len(compressed),
-                "enc_blob": len(enc_blob),
-                "proof": len(proof)
-            },
-            "metadata": metadata
-        })
-
-        st.download_button("Download encrypted file", enc_blob, file_name=uploaded.name + ".enc")
-        st.download_button("Download proof", proof, file_name=uploaded.name + ".proof")
+        st.write(run["report"])
+
+        st.download_button("Download encrypted file", run["enc_blob"], file_name=uploaded.name + ".enc")
+        st.download_button("Download proof", run["proof"], file_name=uploaded.name + ".proof")
 
         # Verify decrypt and proof on demand
         if st.checkbox("Run verification (decrypt + verify proof) now"):
+            he, _, priv = get_encryptor()
             try:
-                recovered = he.decrypt(enc_blob, metadata, priv)
-                ok = (recovered == compressed)
+                recovered = he.decrypt(run["enc_blob"], run["metadata"], priv)
+                ok = (recovered == run["compressed"])
             except Exception as e:
                 ok = False
                 st.error(f"Decryption failed: {e}")
 
-            proof_ok = zkp.verify(chunks, proof)
+            proof_ok = zkp.verify(run["compressed"], run["proof"])
             st.write({"decryption_ok": ok, "proof_ok": proof_ok})
 
         st.write("Files saved to local cloud folder: `cloud/`")
-        st.write(enc_path)
-        st.write(proof_path)
+        st.write(run["enc_path"])
+        st.write(run["proof_path"])
 
 else:
     st.info("Upload a file to enable the pipeline")
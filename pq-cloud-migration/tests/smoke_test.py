@@ -3,6 +3,8 @@ This test uses the simulated KEM if pyoqs is missing so it should run in most de
 """
 import sys
 import os
+import time
+import hashlib
 # Ensure project root on path
 ROOT = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, ROOT)
@@ -10,6 +12,11 @@ sys.path.insert(0, ROOT)
 from crypto.compression import Compressor
 from crypto.hybrid import HybridEncryptor
 from crypto.zkp import BatchZKP
+from crypto.sha256_kernel import HAVE_NUMBA
+
+# Generous ceiling for hashing one 1 KiB chunk (~1 us with SHA-NI); only a
+# large regression in the commitment path, not machine noise, trips it
+HASH_BUDGET_NS_PER_CHUNK = 1_500_000
 
 
 def run_smoke():
@@ -25,10 +32,20 @@ def run_smoke():
     print(f"Compressed size: {len(comp)} bytes")
 
     # Chunk, commitments, proof
+    commitments = zkp.commitments_from_buffer(comp)
     chunks = [comp[i:i+1024] for i in range(0, len(comp), 1024)]
-    commitments = zkp.commitments(chunks)
+    assert zkp.commitments(chunks) == commitments, "List and buffer commitments differ"
     proof = zkp.make_proof(commitments)
-    print(f"Chunks: {len(chunks)}, Proof size: {len(proof)}")
+    print(f"Chunks: {len(commitments)}, Proof size: {len(proof)}")
+
+    # Time the batched hash step over the uncompressed input (13 chunks)
+    raw_chunks = [data[i:i+1024] for i in range(0, len(data), 1024)]
+    t0 = time.perf_counter_ns()
+    zkp.commitments(raw_chunks)
+    dt = time.perf_counter_ns() - t0
+    budget = HASH_BUDGET_NS_PER_CHUNK * len(raw_chunks)
+    assert dt < budget, f"Hashing {len(raw_chunks)} chunks took {dt} ns (budget {budget} ns)"
+    print(f"Hashed {len(raw_chunks)} chunks in {dt / 1e3:.1f} us")
 
     # KEM keypair
     pub, priv = he.generate_kem_keypair()
@@ -41,9 +58,66 @@ def run_smoke():
     print("Encryption/decryption roundtrip OK")
 
     # Verify proof
-    ok = zkp.verify(chunks, proof)
+    ok = zkp.verify(comp, proof)
     assert ok, "Proof verification failed"
     print("ZKP verification OK")
 
+    # Per-chunk Merkle paths over the raw input: 13 chunks (odd count, depth 4)
+    # exercise sibling paths, odd-node promotion and the cached layer
+    raw_commitments = zkp.commitments_from_buffer(data)
+    raw_proof = zkp.make_proof(raw_commitments)
+    for i, chunk in enumerate(raw_chunks):
+        path = zkp.merkle_path(raw_commitments, i)
+        assert zkp.verify_chunk(i, chunk, path, raw_proof), f"Chunk {i} path verification failed"
+    tampered = bytearray(data)
+    tampered[5 * 1024 + 7] ^= 1
+    assert not zkp.verify_chunk(5, bytes(tampered[5 * 1024:6 * 1024]), zkp.merkle_path(raw_commitments, 5),
+                                raw_proof), "Tampered chunk passed path verification"
+    assert not zkp.verify(bytes(tampered), raw_proof), "Tampered buffer passed verification"
+    print(f"Merkle paths OK for {len(raw_chunks)} chunks")
+
+    # Compiled SHA-256 kernel against hashlib: padding edge cases, and a
+    # chunk size that is not a multiple of 64 (generic padding path)
+    if HAVE_NUMBA:
+        from crypto.sha256_kernel import sha256_chunks
+        buf = bytes(range(256)) * 5
+        for chunk_size in (1024, 100):
+            for length in (0, 55, 56, 64, 1023, 1024, 1025):
+                msg = buf[:length]
+                expected = [hashlib.sha256(msg[i:i+chunk_size]).digest() for i in range(0, length, chunk_size)]
+                got = [row.tobytes() for row in sha256_chunks(msg, chunk_size)]
+                assert got == expected, f"Kernel digest mismatch (length {length}, chunk size {chunk_size})"
+        print("Numba SHA-256 kernel matches hashlib")
+
+    # Streaming pipeline (as in app.py): uneven pieces through compressobj,
+    # commitment_stream and encrypt_stream. Up to one LZ4 block the stream is
+    # byte-identical to compress(); past it (the 100 KB case) commitments are
+    # checked against the streamed bytes, which must still decode to the input
+    for sensitivity, payload in (("medium", data), ("low", data * 8 + os.urandom(3000)), ("high", b"")):
+        co = compressor.compressobj(sensitivity)
+        commits = zkp.commitment_stream()
+        sealer = he.encrypt_stream(pub)
+        compressed, parts = [], []
+        offset, step = 0, 1
+        while True:
+            piece = co.compress(payload[offset:offset + step]) if offset < len(payload) else co.flush()
+            compressed.append(piece)
+            commits.update(piece)
+            parts.append(sealer.update(piece))
+            if offset >= len(payload):
+                break
+            offset += step
+            step = step * 7 % 5003 + 1
+        parts.append(sealer.finalize())
+        streamed = b"".join(compressed)
+        one_shot = compressor.compress(payload, sensitivity)
+        expected = streamed if len(payload) > 64 * 1024 else one_shot
+        assert commits.finalize() == zkp.commitments_from_buffer(expected), \
+            "Streamed commitments differ from buffer commitments"
+        recovered = he.decrypt(b"".join(parts), sealer.metadata, priv)
+        assert recovered == streamed, "Streamed ciphertext does not decrypt to the streamed compression"
+        assert compressor.decompress(recovered) == payload, "Streamed pipeline does not round-trip"
+    print("Streaming pipeline round-trip OK")
+
 if __name__ == '__main__':
     run_smoke()
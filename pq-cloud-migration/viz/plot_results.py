@@ -4,15 +4,22 @@ Generates charts and graphs comparing Kyber vs RSA performance.
 """
 import os
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Files only; skip interactive backend probing
 import matplotlib.pyplot as plt
 import json
 from pathlib import Path
 
 
-def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
+def plot_csv(path: str = "data/results.csv", output_dir: str = "data", dpi: int = 150):
     """
     Generate comprehensive comparison charts.
     
+    Args:
+        path: Benchmark results CSV
+        output_dir: Directory for the PNG files
+        dpi: Raster resolution (pass 300 for print-quality figures)
+    
     Charts generated:
     1. Encryption time comparison (Kyber vs RSA)
     2. Proof size comparison
@@ -27,9 +34,24 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     os.makedirs(output_dir, exist_ok=True)
     
-    # Extract method groups
-    df_kyber = df[df.method == "Kyber-512"]
-    df_rsa = df[df.method == "RSA-2048+AES"]
+    # Categorical keys: labels are stored once and grouping works on codes
+    df['method'] = df['method'].astype('category')
+    df['sensitivity'] = df['sensitivity'].astype('category')
+    
+    # Extract method groups (one groupby pass instead of repeated masks)
+    groups = dict(list(df.groupby('method', observed=True)))
+    df_kyber = groups.get("Kyber-512", df.iloc[:0])
+    df_rsa = groups.get("RSA-2048+AES", df.iloc[:0])
+    
+    # Per-method means by sensitivity and by input size, one pivot each
+    # instead of a filter + mean per category
+    methods = ["Kyber-512", "RSA-2048+AES"]
+    sensitivities = ["low", "medium", "high"]
+    by_sens = df.pivot_table(index='sensitivity', columns='method', aggfunc='mean', observed=True,
+                             values=['encrypt_time_ms', 'compression_ratio_percent'])
+    by_size = df.pivot_table(index='input_size_bytes', columns='method', aggfunc='mean', observed=True,
+                             values=['compress_time_ms', 'zkp_time_ms', 'encrypt_time_ms'])
+    enc_by_sens = by_sens['encrypt_time_ms'].reindex(index=sensitivities, columns=methods)
     
     print("\n" + "="*80)
     print("GENERATING VISUALIZATIONS")
@@ -40,15 +62,8 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     fig.suptitle("Post-Quantum vs Classical Hybrid Encryption: Performance Analysis", fontsize=16, fontweight='bold')
     
     # 1.1: Average encryption time by sensitivity
-    sensitivities = ["low", "medium", "high"]
-    kyber_times = []
-    rsa_times = []
-    
-    for sens in sensitivities:
-        kyber_sens = df_kyber[df_kyber.sensitivity == sens]
-        rsa_sens = df_rsa[df_rsa.sensitivity == sens]
-        kyber_times.append(kyber_sens['encrypt_time_ms'].mean() if not kyber_sens.empty else 0)
-        rsa_times.append(rsa_sens['encrypt_time_ms'].mean() if not rsa_sens.empty else 0)
+    kyber_times = enc_by_sens['Kyber-512'].fillna(0).tolist()
+    rsa_times = enc_by_sens['RSA-2048+AES'].fillna(0).tolist()
     
     x = range(len(sensitivities))
     width = 0.35
@@ -63,15 +78,10 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     axes[0, 0].grid(axis='y', alpha=0.3)
     
     # 1.2: Encryption time by file size
-    sizes = sorted(df['input_size_bytes'].unique())
-    kyber_size_times = []
-    rsa_size_times = []
-    
-    for size in sizes:
-        kyber_size = df_kyber[df_kyber.input_size_bytes == size]
-        rsa_size = df_rsa[df_rsa.input_size_bytes == size]
-        kyber_size_times.append(kyber_size['encrypt_time_ms'].mean() if not kyber_size.empty else 0)
-        rsa_size_times.append(rsa_size['encrypt_time_ms'].mean() if not rsa_size.empty else 0)
+    sizes = by_size.index.tolist()  # pivot_table sorts the index
+    enc_by_size = by_size['encrypt_time_ms'].reindex(columns=methods).fillna(0)
+    kyber_size_times = enc_by_size['Kyber-512'].tolist()
+    rsa_size_times = enc_by_size['RSA-2048+AES'].tolist()
     
     size_labels = [f"{int(s/1024)}KB" if s < 1024*1024 else f"{int(s/(1024*1024))}MB" for s in sizes]
     x2 = range(len(sizes))
@@ -103,8 +113,9 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
                        ha='center', va='bottom', fontweight='bold')
     
     # 1.4: Compression ratio
-    comp_ratios_kyber = df_kyber.groupby('sensitivity')['compression_ratio_percent'].mean()
-    comp_ratios_rsa = df_rsa.groupby('sensitivity')['compression_ratio_percent'].mean()
+    comp_by_sens = by_sens['compression_ratio_percent'].reindex(columns=methods)
+    comp_ratios_kyber = comp_by_sens['Kyber-512'].dropna()
+    comp_ratios_rsa = comp_by_sens['RSA-2048+AES'].dropna()
     
     sensitivities_available = list(comp_ratios_kyber.index) if not comp_ratios_kyber.empty else list(comp_ratios_rsa.index)
     x3 = range(len(sensitivities_available))
@@ -124,7 +135,7 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     plt.tight_layout()
     chart1_path = os.path.join(output_dir, "comparison_analysis.png")
-    plt.savefig(chart1_path, dpi=300, bbox_inches='tight')
+    plt.savefig(chart1_path, dpi=dpi)
     print(f"✓ Saved: {chart1_path}")
     plt.close()
     
@@ -134,9 +145,7 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     # 2.1: Speedup factor (log scale)
     speedup_factors = []
-    for sens in sensitivities:
-        kyber_t = df_kyber[df_kyber.sensitivity == sens]['encrypt_time_ms'].mean()
-        rsa_t = df_rsa[df_rsa.sensitivity == sens]['encrypt_time_ms'].mean()
+    for kyber_t, rsa_t in enc_by_sens.itertuples(index=False):
         if kyber_t > 0:
             speedup_factors.append(rsa_t / kyber_t)
         else:
@@ -155,20 +164,13 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     # 2.2: Total time breakdown for 100KB file
     size_100k = 100 * 1024
-    df_100k_kyber = df_kyber[df_kyber.input_size_bytes == size_100k]
-    df_100k_rsa = df_rsa[df_rsa.input_size_bytes == size_100k]
-    
-    if not df_100k_kyber.empty and not df_100k_rsa.empty:
-        kyber_breakdown = {
-            'Compression': df_100k_kyber['compress_time_ms'].mean(),
-            'ZKP': df_100k_kyber['zkp_time_ms'].mean(),
-            'Encryption': df_100k_kyber['encrypt_time_ms'].mean(),
-        }
-        rsa_breakdown = {
-            'Compression': df_100k_rsa['compress_time_ms'].mean(),
-            'ZKP': df_100k_rsa['zkp_time_ms'].mean(),
-            'Encryption': df_100k_rsa['encrypt_time_ms'].mean(),
-        }
+    stages = {'Compression': 'compress_time_ms', 'ZKP': 'zkp_time_ms', 'Encryption': 'encrypt_time_ms'}
+    breakdown_cols = [(col, m) for col in stages.values() for m in methods]
+    row_100k = by_size.reindex(columns=breakdown_cols).loc[size_100k] if size_100k in by_size.index else None
+    
+    if row_100k is not None and row_100k.notna().all():
+        kyber_breakdown = {stage: row_100k[col, 'Kyber-512'] for stage, col in stages.items()}
+        rsa_breakdown = {stage: row_100k[col, 'RSA-2048+AES'] for stage, col in stages.items()}
         
         x_pos = [0, 1]
         kyber_vals = list(kyber_breakdown.values())
@@ -195,7 +197,7 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     plt.tight_layout()
     chart2_path = os.path.join(output_dir, "kyber_advantages.png")
-    plt.savefig(chart2_path, dpi=300, bbox_inches='tight')
+    plt.savefig(chart2_path, dpi=dpi)
     print(f"✓ Saved: {chart2_path}")
     plt.close()
     
@@ -225,7 +227,7 @@ def plot_csv(path: str = "data/results.csv", output_dir: str = "data"):
     
     plt.tight_layout()
     chart3_path = os.path.join(output_dir, "security_performance_tradeoff.png")
-    plt.savefig(chart3_path, dpi=300, bbox_inches='tight')
+    plt.savefig(chart3_path, dpi=dpi)
     print(f"✓ Saved: {chart3_path}")
     plt.close()
     